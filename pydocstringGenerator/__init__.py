@@ -5,10 +5,16 @@ docstrings in various formats (Google, NumPy, reST).
 """
 
 import ast
-import tempfile
-import os
+import hashlib
+import tokenize
+import threading
+import warnings
+from collections import OrderedDict, deque
 from pathlib import Path
-import pydocstyle
+
+from pydocstyle.checker import ConventionChecker
+from pydocstyle.parser import AllError, ParseError
+from pydocstyle.violations import conventions
 
 __version__ = "1.0.0"
 __author__ = "Himanshu Chawla"
@@ -16,6 +22,7 @@ __all__ = [
     "load_pyproject",
     "attach_parents",
     "extract_parameters",
+    "parse_code",
     "map_nodes",
     "add_module_docstring",
     "detect_raises",
@@ -27,8 +34,19 @@ __all__ = [
     "build_docstring",
     "insert_docstrings_into_code",
     "check_pep257",
+    "check_pep257_batch",
 ]
 
+# Parsed trees keyed by source digest, oldest evicted first
+_PARSE_CACHE_SIZE = 256
+_parse_cache = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+# Node type groups hoisted out of the traversal loops
+_FUNC_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef)
+_YIELD_TYPES = frozenset({ast.Yield, ast.YieldFrom})
+_SCOPE_TYPES = frozenset({ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda})
+
 
 def load_pyproject():
     """Loading project configuration from pyproject.toml."""
@@ -44,20 +62,69 @@ def load_pyproject():
         return {}
 
 
+def parse_code(code):
+    """Parse source code, reusing the tree of an identical earlier source.
+
+    Trees are shared between callers and must be treated as read-only.
+
+    Args:
+        code: Python source code as string.
+
+    Returns:
+        Parsed ast.Module for the code.
+    """
+    key = hashlib.blake2b(code.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _parse_cache_lock:
+        tree = _parse_cache.get(key)
+        if tree is not None:
+            _parse_cache.move_to_end(key)
+            return tree
+
+    tree = ast.parse(code)
+    with _parse_cache_lock:
+        _parse_cache[key] = tree
+        if len(_parse_cache) > _PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return tree
+
+
 def attach_parents(tree):
     """Attach parent pointers to all AST nodes.
 
+    Deprecated: map_nodes no longer needs parent pointers.
+
     Args:
         tree: AST tree to process.
 
     Returns:
         None. Modifies tree in-place.
     """
+    warnings.warn(
+        "attach_parents() is deprecated; map_nodes() no longer needs parent pointers",
+        DeprecationWarning,
+        stacklevel=2,
+    )
     for node in ast.walk(tree):
         for child in ast.iter_child_nodes(node):
             child.parent = node
 
 
+def _get_docstring(node):
+    """Return the docstring of a node, caching it on the node.
+
+    Args:
+        node: AST node that can carry a docstring.
+
+    Returns:
+        Cleaned docstring, or None if the node has none.
+    """
+    try:
+        return node._docstring
+    except AttributeError:
+        node._docstring = ast.get_docstring(node)
+        return node._docstring
+
+
 def extract_parameters(node):
     """Return safe parameter list for functions and methods.
 
@@ -67,58 +134,85 @@ def extract_parameters(node):
     Returns:
         List of parameter names.
     """
-    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+    if isinstance(node, _FUNC_TYPES):
         return [a.arg for a in node.args.args]
     return []
 
 
-def map_nodes(tree):
-    """Create mapping of classes and functions including docstring presence.
+def _collect_nodes(node, node_map):
+    """Add the functions and classes defined below a node to a node mapping.
+
+    Nodes are visited breadth-first, in the same order as ast.walk(), but
+    expressions are skipped since they cannot contain definitions. Functions
+    directly in a class body are recorded as that class's methods; all other
+    functions are recorded as functions.
 
     Args:
-        tree: AST tree to analyze.
+        node: AST node whose descendants are scanned.
+        node_map: Mapping being built by map_nodes().
 
     Returns:
-        Dictionary with 'functions' and 'classes' keys containing metadata.
+        None. Modifies node_map in-place.
     """
-    node_map = {"functions": [], "classes": []}
-
-    for node in ast.walk(tree):
-
-        # -------- Functions --------
-        if isinstance(node, ast.FunctionDef) and not isinstance(getattr(node, "parent", None), ast.ClassDef):
-            node_map["functions"].append(
-                {
-                    "node": node,
-                    "name": node.name,
-                    "params": extract_parameters(node),
-                    "has_doc": ast.get_docstring(node) is not None,
-                }
-            )
-
-        # -------- Classes --------
-        if isinstance(node, ast.ClassDef):
-            class_entry = {
-                "node": node,
-                "name": node.name,
-                "params": [],
-                "has_doc": ast.get_docstring(node) is not None,
-                "methods": [],
-            }
-
-            for item in node.body:
-                if isinstance(item, ast.FunctionDef):
-                    class_entry["methods"].append(
+    queue = deque([node])
+    while queue:
+        parent = queue.popleft()
+        in_class = type(parent) is ast.ClassDef
+        for child in ast.iter_child_nodes(parent):
+            t = type(child)
+
+            # -------- Functions --------
+            if t is ast.FunctionDef:
+                if not in_class:
+                    node_map["functions"].append(
                         {
-                            "node": item,
-                            "name": item.name,
-                            "params": extract_parameters(item),
-                            "has_doc": ast.get_docstring(item) is not None,
+                            "node": child,
+                            "name": child.name,
+                            "params": extract_parameters(child),
+                            "has_doc": _get_docstring(child) is not None,
                         }
                     )
 
-            node_map["classes"].append(class_entry)
+            # -------- Classes --------
+            elif t is ast.ClassDef:
+                class_entry = {
+                    "node": child,
+                    "name": child.name,
+                    "params": [],
+                    "has_doc": _get_docstring(child) is not None,
+                    "methods": [],
+                }
+
+                for item in child.body:
+                    if type(item) is ast.FunctionDef:
+                        class_entry["methods"].append(
+                            {
+                                "node": item,
+                                "name": item.name,
+                                "params": extract_parameters(item),
+                                "has_doc": _get_docstring(item) is not None,
+                            }
+                        )
+
+                node_map["classes"].append(class_entry)
+
+            elif isinstance(child, ast.expr):
+                continue
+
+            queue.append(child)
 
+
+def map_nodes(tree):
+    """Create mapping of classes and functions including docstring presence.
+
+    Args:
+        tree: AST tree to analyze.
+
+    Returns:
+        Dictionary with 'functions' and 'classes' keys containing metadata.
+    """
+    node_map = {"functions": [], "classes": []}
+    _collect_nodes(tree, node_map)
     return node_map
 
 
@@ -132,8 +226,8 @@ def add_module_docstring(code):
         Code with module docstring added if missing.
     """
     try:
-        tree = ast.parse(code)
-        if ast.get_docstring(tree) is not None:
+        tree = parse_code(code)
+        if _get_docstring(tree) is not None:
             return code
     except SyntaxError:
         return code
@@ -145,6 +239,8 @@ def add_module_docstring(code):
 def detect_raises(node):
     """Return a list of exceptions raised inside a function.
 
+    Raises inside nested functions, lambdas and classes are not counted.
+
     Args:
         node: AST node to analyze.
 
@@ -152,27 +248,42 @@ def detect_raises(node):
         List of exception class names found in raise statements.
     """
     raises = []
-    for n in ast.walk(node):
-        if isinstance(n, ast.Raise) and n.exc:
+    stack = list(ast.iter_child_nodes(node))
+    while stack:
+        n = stack.pop()
+        t = type(n)
+        if t is ast.Raise and n.exc:
             if isinstance(n.exc, ast.Call):
                 raises.append(n.exc.func.id)
             elif isinstance(n.exc, ast.Name):
                 raises.append(n.exc.id)
+        elif t in _SCOPE_TYPES:
+            continue
+        stack.extend(ast.iter_child_nodes(n))
     return raises
 
 
 def detect_yields(node):
     """Return True if function contains yield statements.
 
+    Yields inside nested functions and lambdas do not make the function a
+    generator, so those scopes are not searched.
+
     Args:
         node: AST node to analyze.
 
     Returns:
         Boolean indicating if node contains yield/yieldfrom.
     """
-    for n in ast.walk(node):
-        if isinstance(n, (ast.Yield, ast.YieldFrom)):
+    stack = list(ast.iter_child_nodes(node))
+    while stack:
+        n = stack.pop()
+        t = type(n)
+        if t in _YIELD_TYPES:
             return True
+        if t in _SCOPE_TYPES:
+            continue
+        stack.extend(ast.iter_child_nodes(n))
     return False
 
 
@@ -183,25 +294,39 @@ def detect_attributes(class_node):
         class_node: AST ClassDef node to analyze.
 
     Returns:
-        List of unique attribute names found in the class.
+        List of unique attribute names found in the class, in source order.
     """
-    attrs = []
+    attrs = {}
 
     for n in class_node.body:
         # class variable assignments: x = 10
         if isinstance(n, ast.Assign):
             for t in n.targets:
                 if isinstance(t, ast.Name):
-                    attrs.append(t.id)
+                    attrs[t.id] = None
 
-        # inside functions: self.x = ...
+        # inside methods: self.x = ... (nested defs and classes rebind self)
         if isinstance(n, ast.FunctionDef):
-            for inner in ast.walk(n):
+            stack = n.body[::-1]
+            while stack:
+                inner = stack.pop()
                 if isinstance(inner, ast.Assign):
                     for t in inner.targets:
                         if isinstance(t, ast.Attribute) and isinstance(t.value, ast.Name) and t.value.id == "self":
-                            attrs.append(t.attr)
-    return list(set(attrs))
+                            attrs[t.attr] = None
+                elif type(inner) not in _SCOPE_TYPES:
+                    children = [c for c in ast.iter_child_nodes(inner) if not isinstance(c, ast.expr)]
+                    stack.extend(reversed(children))
+    return list(attrs)
+
+
+# Fixed template fragments surrounding the summary and parameter block
+_GOOGLE_HEAD = "\n\nArgs:\n"
+_GOOGLE_TAIL = '\nReturns:\n    Description.\n"""'
+_NUMPY_HEAD = "\n\nParameters\n----------\n"
+_NUMPY_TAIL = '\n\nReturns\n-------\ntype\n    Description.\n"""'
+_REST_HEAD = "\n\n"
+_REST_TAIL = '\n\n:returns: Description.\n"""'
 
 
 def generate_docstring_google(name, params):
@@ -214,17 +339,8 @@ def generate_docstring_google(name, params):
     Returns:
         Google-style docstring string.
     """
-    summary = name.capitalize() + "."
-
-    param_lines = "\n".join([f"    {p}: Description." for p in params])
-
-    return f'''"""{summary}
-
-Args:
-{param_lines if params else "    None"}
-Returns:
-    Description.
-"""'''
+    param_lines = "\n".join([f"    {p}: Description." for p in params]) or "    None"
+    return '"""' + name.capitalize() + "." + _GOOGLE_HEAD + param_lines + _GOOGLE_TAIL
 
 
 def generate_docstring_numpy(name, params):
@@ -237,21 +353,8 @@ def generate_docstring_numpy(name, params):
     Returns:
         NumPy-style docstring string.
     """
-    summary = name.capitalize() + "."
-
-    param_lines = "\n".join([f"{p} : type\n    Description." for p in params])
-
-    return f'''"""{summary}
-
-Parameters
-----------
-{param_lines if params else "None"}
-
-Returns
--------
-type
-    Description.
-"""'''
+    param_lines = "\n".join([f"{p} : type\n    Description." for p in params]) or "None"
+    return '"""' + name.capitalize() + "." + _NUMPY_HEAD + param_lines + _NUMPY_TAIL
 
 
 def generate_docstring_rest(name, params):
@@ -264,16 +367,15 @@ def generate_docstring_rest(name, params):
     Returns:
         reST-style docstring string.
     """
-    summary = name.capitalize() + "."
-
     param_lines = "\n".join([f":param {p}: Description." for p in params])
+    return '"""' + name.capitalize() + "." + _REST_HEAD + param_lines + _REST_TAIL
 
-    return f'''"""{summary}
 
-{param_lines if params else ""}
-
-:returns: Description.
-"""'''
+_BUILDERS = {
+    "Google": generate_docstring_google,
+    "NumPy": generate_docstring_numpy,
+    "reST": generate_docstring_rest,
+}
 
 
 def build_docstring(format_type, name, params):
@@ -287,11 +389,41 @@ def build_docstring(format_type, name, params):
     Returns:
         Formatted docstring string.
     """
-    if format_type == "Google":
-        return generate_docstring_google(name, params)
-    if format_type == "NumPy":
-        return generate_docstring_numpy(name, params)
-    return generate_docstring_rest(name, params)
+    return _BUILDERS.get(format_type, generate_docstring_rest)(name, params)
+
+
+def _is_docstring_expr(stmt):
+    """Return True if a statement is a bare string literal expression.
+
+    Args:
+        stmt: AST statement node to check.
+
+    Returns:
+        Boolean indicating if stmt can be a docstring.
+    """
+    return type(stmt) is ast.Expr and type(stmt.value) is ast.Constant and type(stmt.value.value) is str
+
+
+def _line_offsets(code):
+    """Return the start offset of every line plus an end-of-code sentinel.
+
+    Line ``k`` (0-based) spans ``code[offsets[k]:offsets[k + 1]]`` including
+    its trailing newline.
+
+    Args:
+        code: Python source code as string.
+
+    Returns:
+        List of integer offsets into code.
+    """
+    offsets = [0]
+    find = code.find
+    pos = find("\n")
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = find("\n", pos + 1)
+    offsets.append(len(code))
+    return offsets
 
 
 def insert_docstrings_into_code(code, node_map, format_type, mode):
@@ -306,10 +438,9 @@ def insert_docstrings_into_code(code, node_map, format_type, mode):
     Returns:
         Updated code with docstrings inserted/modified.
     """
-    lines = code.split("\n")
-    new_lines = lines.copy()
+    offsets = _line_offsets(code)
 
-    # Sort nodes bottom to top
+    # Sort nodes top to bottom
     all_nodes = []
     for fn in node_map["functions"]:
         all_nodes.append(fn)
@@ -318,8 +449,10 @@ def insert_docstrings_into_code(code, node_map, format_type, mode):
         for m in cls["methods"]:
             all_nodes.append(m)
 
-    all_nodes = sorted(all_nodes, key=lambda x: x["node"].lineno, reverse=True)
+    all_nodes = sorted(all_nodes, key=lambda x: x["node"].lineno)
 
+    # Collect (start_del, end_del, replacement_block, newline) edits in line order
+    edits = []
     for item in all_nodes:
         node = item["node"]
         name = item["name"]
@@ -332,13 +465,14 @@ def insert_docstrings_into_code(code, node_map, format_type, mode):
 
         doc = build_docstring(format_type, name, params)
 
-        # Determine indentation level
-        def_line = lines[node.lineno - 1]
+        # Determine indentation level and line terminator
+        def_line = code[offsets[node.lineno - 1] : offsets[node.lineno]]
+        newline = "\r\n" if def_line.endswith("\r\n") else "\n"
+        def_line = def_line.rstrip("\r\n")
         indent = len(def_line) - len(def_line.lstrip(" "))
 
         # Build formatted docstring lines
-        doc_lines = []
-        doc_content = [line for line in doc.split("\n")]
+        doc_content = doc.split("\n")
 
         # Remove empty first/last lines
         while doc_content and doc_content[0].strip() == "":
@@ -346,29 +480,81 @@ def insert_docstrings_into_code(code, node_map, format_type, mode):
         while doc_content and doc_content[-1].strip() == "":
             doc_content.pop()
 
-        doc_lines = [" " * (indent + 4) + line for line in doc_content]
+        pad = " " * (indent + 4)
+        doc_block = "".join([pad + line + newline for line in doc_content])
 
         # Insert docstring immediately after def line
-        insertion_index = node.lineno
+        start = end = node.lineno
 
-        # If function/class already has docstring, remove it first
+        # If function/class already has docstring, replace it
         if has_doc:
             first_stmt = node.body[0]
-            if isinstance(first_stmt, ast.Expr) and isinstance(first_stmt.value, ast.Str):
+            if _is_docstring_expr(first_stmt):
                 start = first_stmt.lineno - 1
                 end = first_stmt.end_lineno
-                del new_lines[start:end]
-                insertion_index = start
 
-        # Insert docstring block
-        for lines in reversed(doc_lines):
-            new_lines.insert(insertion_index, lines)
+        edits.append((start, end, doc_block, newline))
+
+    # Emit untouched source slices and docstring blocks in a single pass
+    chunks = []
+    pos = 0
+    for start, end, doc_block, newline in edits:
+        head = code[pos : offsets[start]]
+        chunks.append(head)
+        # Only the last line can be unterminated; never glue a block onto it
+        if head and not head.endswith("\n"):
+            chunks.append(newline)
+        chunks.append(doc_block)
+        pos = max(pos, offsets[end])
+    chunks.append(code[pos:])
+
+    return "".join(chunks)
+
+
+def _check_source(checker, code, filename):
+    """Yield PEP-257 violations for source code without touching disk.
+
+    Mirrors ``pydocstyle.check`` for a single file, including how parse
+    errors are reported.
+
+    Args:
+        checker: pydocstyle ConventionChecker to run.
+        code: Python source code as string.
+        filename: Name reported in violations.
+
+    Yields:
+        pydocstyle violation objects, or the error that stopped parsing.
+    """
+    # Text read with encoding="utf-8" keeps the BOM, which the checker cannot tokenize
+    if code.startswith("\ufeff"):
+        code = code[1:]
+    try:
+        for error in checker.check_source(code, filename):
+            if getattr(error, "code", None) in conventions.pep257:
+                yield error
+    except (AllError, ParseError) as error:
+        yield error
+    except tokenize.TokenError:
+        yield SyntaxError(f"invalid syntax in file {filename}")
+
+
+def check_pep257_batch(sources):
+    """Run pydocstyle on several sources at once and return violations per source.
 
-    return "\n".join(new_lines)
+    Sources are checked in memory with one shared checker.
+
+    Args:
+        sources: Mapping of filename to Python source code.
+
+    Returns:
+        Dictionary mapping each filename to its list of pydocstyle violations.
+    """
+    checker = ConventionChecker()
+    return {name: list(_check_source(checker, code, name)) for name, code in sources.items()}
 
 
 def check_pep257(code):
-    """Run pydocstyle on a temporary file and return violations.
+    """Run pydocstyle on source code and return violations.
 
     Args:
         code: Python source code as string.
@@ -376,10 +562,4 @@ def check_pep257(code):
     Returns:
         List of pydocstyle violation objects.
     """
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".py", mode="w", encoding="utf-8") as tmp:
-        tmp.write(code)
-        tmp_path = tmp.name
-
-    violations = list(pydocstyle.check([tmp_path]))
-    os.remove(tmp_path)
-    return violations
+    return check_pep257_batch({"<string>": code})["<string>"]
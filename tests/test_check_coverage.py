@@ -0,0 +1,58 @@
+"""Tests for the docstring coverage hook."""
+
+import ast
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+_spec = importlib.util.spec_from_file_location(
+    "check_coverage", Path(__file__).resolve().parent.parent / "tools" / "check_coverage.py"
+)
+check_coverage = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(check_coverage)
+
+CASES = [
+    'def f():\n    """doc"""\n',
+    "def f():\n    pass\n",
+    'async def f():\n    """doc"""\n',
+    'class A:\n    """doc"""\n\n    def m(self):\n        return 1\n',
+    'def f():\n    r"""doc"""\n',
+    'def f():\n    b"""doc"""\n',
+    'def f():\n    """"""\n',
+    'def f():\n    """D.""".format(x)\n',
+    'def f():\n    """D.\n    more\n    """.strip()\n',
+    'def f():\n    """D."""  # trailing comment\n',
+    'def f():\n    ("""doc""")\n',
+    'def f():\n    (\n        """doc"""\n    )\n',
+    'def f(a={1:\n 2}):\n    """doc"""\n',
+    'def f(key=lambda:\n      0):\n    """doc"""\n',
+    'def f(a,  # note):\n      b):\n    """doc"""\n',
+    'def f(a="))", b={1:\n 2}):\n    """doc"""\n',
+    'def\tf():\n    """doc"""\n',
+    "class\tA:\n    pass\n",
+    "async  def f():\n    pass\n",
+    'x = """\ndef f():\n    pass\n"""\n',
+    'def f():\n    x = 1\n    """not a docstring"""\n',
+]
+
+
+def _ast_counts(code):
+    """Count definitions and documented definitions the way the AST fallback does."""
+    nodes = [n for n in ast.walk(ast.parse(code)) if type(n) in check_coverage._DEF_NODE_TYPES]
+    return len(nodes), sum(1 for n in nodes if ast.get_docstring(n))
+
+
+@pytest.mark.parametrize("code", CASES)
+def test_scan_counts_never_disagrees_with_ast(code):
+    """The line scanner either matches the AST walk or defers to it."""
+    counts = check_coverage._scan_counts(code.encode("utf-8"))
+    assert counts is None or counts == _ast_counts(code)
+
+
+@pytest.mark.parametrize("code", CASES)
+def test_count_docstrings_matches_ast(code, tmp_path):
+    """File counts always equal the AST walk, whichever path produced them."""
+    path = tmp_path / "sample.py"
+    path.write_text(code, encoding="utf-8")
+    assert check_coverage.count_docstrings(path) == _ast_counts(code)
@@ -0,0 +1,31 @@
+"""Tests for the PEP-257 checks."""
+
+import pytest
+
+from pydocstringGenerator import check_pep257, check_pep257_batch
+
+
+def _codes(violations):
+    """Return the violation codes, failing on parse errors."""
+    assert all(hasattr(v, "code") for v in violations), violations
+    return [v.code for v in violations]
+
+
+@pytest.mark.parametrize(
+    "code, expected",
+    [
+        ("def f():\n    pass\n", ["D100", "D103"]),
+        ("x = 1\n", ["D100"]),
+    ],
+)
+def test_leading_bom_is_ignored(code, expected):
+    """A UTF-8 BOM left by encoding="utf-8" reads must not turn into a parse error."""
+    assert _codes(check_pep257(code)) == expected
+    assert _codes(check_pep257("\ufeff" + code)) == expected
+
+
+def test_batch_reports_given_names():
+    """Violations carry the name each source was passed under."""
+    report = check_pep257_batch({"pkg/a.py": "def f():\n    pass\n", "b.py": '"""Doc."""\n'})
+    assert [v.filename for v in report["pkg/a.py"]] == ["pkg/a.py", "pkg/a.py"]
+    assert report["b.py"] == []
@@ -1,28 +1,155 @@
 """Check coverage."""
 
 import ast
+import codecs
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 THRESHOLD = 80  # or read from pyproject.toml if you want
+PARALLEL_MIN_FILES = 32  # below this, process spawn overhead outweighs the gain
 
+_DEF_PREFIXES = (b"def ", b"async def ", b"class ")
+_DEF_KEYWORDS = (b"def", b"class", b"async")
+_TRIPLE_QUOTES = (b'"""', b"'''")
+_OPEN_BRACKETS = (b"(", b"[", b"{")
+_CLOSE_BRACKETS = (b")", b"]", b"}")
+_DEF_NODE_TYPES = frozenset({ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef})
 
-def calc_coverage(path: Path) -> float:
-    """Calculate docstring coverage for a single file."""
+
+def _odd_header(line: bytes) -> bool:
+    """Return True if a definition keyword is followed by anything but a single space."""
+    for keyword in _DEF_KEYWORDS:
+        sep = line[len(keyword) : len(keyword) + 1]
+        if line.startswith(keyword) and sep.isspace():
+            rest = line[len(keyword) + 1 :]
+            if sep != b" " or rest[:1].isspace():
+                return True
+            return keyword == b"async" and _odd_header(rest)
+    return False
+
+
+def _complete_header(line: bytes) -> bool:
+    """Return True if a header line ends in a colon, closes every bracket and holds no string or comment."""
+    if not line.endswith(b":") or b"#" in line or b'"' in line or b"'" in line:
+        return False
+    return sum(line.count(b) for b in _OPEN_BRACKETS) == sum(line.count(b) for b in _CLOSE_BRACKETS)
+
+
+def _scan_counts(data: bytes):
+    """Count definitions and docstrings with a line scanner, or None if unsure."""
+    if data.startswith(codecs.BOM_UTF8):
+        data = data[len(codecs.BOM_UTF8) :]
+
+    node_count = 0
+    doc_count = 0
+    quote = None  # delimiter of the triple-quoted string spanning lines
+    pending = False  # last header still waits for its first statement
+    in_doc = False  # the open triple-quoted string is a counted docstring
+
+    for raw in data.split(b"\n"):
+        line = raw.strip()
+
+        if quote is None:
+            if not line or line.startswith(b"#"):
+                continue
+            if line.endswith(b"\\"):
+                return None
+
+            if pending:
+                pending = False
+                body = line[1:] if line[:1] in b"rRuU" else line
+                if body.startswith(b"("):
+                    return None  # a parenthesized docstring still counts
+                if body.startswith(_TRIPLE_QUOTES):
+                    end = body.find(body[:3], 3)
+                    if end != -1 and not body[3:end].strip():
+                        return None
+                    doc_count += 1
+                    in_doc = True
+                elif body[:1] in (b'"', b"'"):
+                    return None
+
+            if _odd_header(line):
+                return None
+            if line.startswith(_DEF_PREFIXES):
+                # A colon inside open brackets (a dict or lambda default) does not end the header
+                if not _complete_header(line):
+                    return None
+                node_count += 1
+                pending = True
+
+        # Track triple-quoted strings so their contents are never scanned
+        pos = 0
+        while True:
+            if quote is None:
+                hits = [i for i in (line.find(b'"""', pos), line.find(b"'''", pos)) if i != -1]
+                if not hits:
+                    break
+                idx = min(hits)
+                before = line[pos:idx]
+                if b"#" in before or b'"' in before or b"'" in before or b"\\" in before:
+                    return None
+                quote = line[idx : idx + 3]
+            else:
+                idx = line.find(quote, pos)
+                if idx == -1:
+                    break
+                if line[idx - 1 : idx] == b"\\":
+                    return None
+                if in_doc:
+                    # Anything after the docstring, e.g. .format(), makes it an expression
+                    rest = line[idx + 3 :].lstrip()
+                    if rest and not rest.startswith(b"#"):
+                        return None
+                    in_doc = False
+                quote = None
+            pos = idx + 3
+
+    return node_count, doc_count
+
+
+def count_docstrings(path: Path) -> tuple:
+    """Return (definitions, documented definitions) for a single file."""
     try:
-        code = path.read_text(encoding="utf-8")
+        data = path.read_bytes()
     except Exception:
-        return 100.0
+        return 0, 0
+
+    counts = _scan_counts(data)
+    if counts is not None:
+        return counts
+
+    try:
+        code = data.decode("utf-8")
+    except UnicodeDecodeError:
+        return 0, 0
 
     tree = ast.parse(code)
     doc_count = 0
     node_count = 0
 
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if type(node) in _DEF_NODE_TYPES:
             node_count += 1
             if ast.get_docstring(node):
                 doc_count += 1
+        stack.extend(ast.iter_child_nodes(node))
+
+    return node_count, doc_count
+
+
+def calc_coverage(path: Path) -> float:
+    """Calculate docstring coverage for a single file."""
+    node_count, doc_count = count_docstrings(path)
 
     if node_count == 0:
         return 100.0
@@ -30,19 +157,57 @@ def calc_coverage(path: Path) -> float:
     return (doc_count / node_count) * 100
 
 
+def _walk_py(root: str):
+    """Yield all .py files under root, skipping virtualenv and unreadable directories."""
+    try:
+        it = os.scandir(root)
+    except PermissionError:
+        return
+    with it:
+        for entry in it:
+            if "venv" in entry.path.lower():
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_py(entry.path)
+            elif entry.name.endswith(".py") and entry.is_file():
+                yield Path(entry.path)
+
+
+def _mean_coverage(nodes, documented) -> float:
+    """Average per-file coverage, counting files without definitions as 100%."""
+    total = 0.0
+    for n, d in zip(nodes, documented):
+        total += 100.0 if n == 0 else (d / n) * 100
+    return total / len(nodes)
+
+
+def _mean_coverage_np(nodes, documented) -> float:
+    """Average per-file coverage with vectorized numpy operations."""
+    # A single pass over a few thousand ints takes microseconds; a JIT compile never pays off here
+    coverage = np.where(nodes == 0, 100.0, documented * 100.0 / np.maximum(nodes, 1))
+    return float(coverage.mean())
+
+
 def main():
     """Run docstring coverage check for ALL Python files in the repo."""
-    py_files = [p for p in Path(".").rglob("*.py") if "venv" not in str(p).lower()]
+    py_files = list(_walk_py("."))
 
     if not py_files:
         print("No Python files found.")
         return 0
 
-    total = 0
-    for f in py_files:
-        total += calc_coverage(f)
+    if len(py_files) < PARALLEL_MIN_FILES:
+        counts = [count_docstrings(f) for f in py_files]
+    else:
+        with ProcessPoolExecutor() as ex:
+            counts = list(ex.map(count_docstrings, py_files, chunksize=16))
 
-    avg = total / len(py_files)
+    if np is not None:
+        nodes = np.fromiter((c[0] for c in counts), dtype=np.int32, count=len(counts))
+        documented = np.fromiter((c[1] for c in counts), dtype=np.int32, count=len(counts))
+        avg = _mean_coverage_np(nodes, documented)
+    else:
+        avg = _mean_coverage([c[0] for c in counts], [c[1] for c in counts])
 
     if avg < THRESHOLD:
         print(
@@ -51,10 +216,8 @@ def main():
         )
 
         sys.exit(1)
-
-        print(
-            f"\n[SUCCESS] Docstring Coverage Passed: {avg:.2f}% >= required {THRESHOLD}%\n"
-        )
+    else:
+        print(f"\n[SUCCESS] Docstring Coverage Passed: {avg:.2f}% >= required {THRESHOLD}%\n")
 
     return 0
 